@@ -1,12 +1,30 @@
 from flask import Flask, render_template, request, jsonify
-import json
-import traceback
+from flask.json.provider import DefaultJSONProvider
+from functools import lru_cache
+import numpy as np
+
+# orjson serialises responses in Rust; fall back to Flask's default provider without it
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("orjson not installed, using Flask's default JSON provider")
+
+# fastnumbers parses answer columns in one C call; fall back to float() per field without it
+try:
+    from fastnumbers import try_float
+
+    FASTNUMBERS_AVAILABLE = True
+except ImportError:
+    FASTNUMBERS_AVAILABLE = False
+    print("fastnumbers not installed, parsing answers with float()")
 
 # Import the compiled Cython module
 try:
     import options_ladder_fast
 
-    CYTHON_AVAILABLE = True
     print("Successfully imported options_ladder_fast")
 
     # Check what functions are available
@@ -22,13 +40,83 @@ try:
         print(f"Missing functions: {missing_functions}")
         print("You may need to recompile the Cython module with the latest code.")
 
+    # Resolve the generators once so requests don't probe the module
+    generate_spreads_exercise = getattr(options_ladder_fast, 'generate_exercise_ladder_with_spreads', None)
+    generate_simple_exercise = getattr(options_ladder_fast, 'generate_exercise_ladder', None)
+    spreads_error = 'Function generate_exercise_ladder_with_spreads not found. Please recompile the Cython module with the latest code.'
+    if hasattr(options_ladder_fast, 'generate_options_ladder_fast'):
+        simple_error = 'Function generate_exercise_ladder not found. Only basic ladder generation available. Please recompile with the latest code.'
+    else:
+        simple_error = 'Required functions not found. Please recompile the Cython module.'
+
 except ImportError as e:
-    CYTHON_AVAILABLE = False
     print(f"Failed to import options_ladder_fast: {e}")
     print("Please compile first with: python setup.py build_ext --inplace")
 
+    generate_spreads_exercise = None
+    spreads_error = simple_error = 'Cython module not compiled. Run: python setup.py build_ext --inplace'
+
+    # Fall back to the Numba port of the ladder generator for simple exercises
+    try:
+        import ladder_numba
+
+        generate_simple_exercise = ladder_numba.generate_exercise_ladder
+        print("Using ladder_numba fallback (simple exercises only)")
+    except ImportError:
+        generate_simple_exercise = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses with orjson (numpy arrays included)"""
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype=self.mimetype)
+
+
 app = Flask(__name__)
 
+# Bounds match the strike-count input in the UI (min="3" max="10")
+MIN_STRIKES = 3
+MAX_STRIKES = 10
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+
+@lru_cache(maxsize=None)
+def error_body(message):
+    """Encoded {'success': False, 'error': message} body, built once per message"""
+    return app.json.dumps({'success': False, 'error': message})
+
+
+def error_response(message):
+    return app.response_class(error_body(message), mimetype='application/json')
+
+
+def parse_answer(value):
+    """Parse a submitted price, returning NaN when the field is blank or malformed"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_answers(values):
+    """Parse submitted prices; blank or malformed fields become NaN"""
+    if FASTNUMBERS_AVAILABLE:
+        return np.array(try_float(values, on_fail=np.nan, on_type_error=np.nan, map=list), dtype=float)
+    return np.array([parse_answer(value) for value in values], dtype=float)
+
 
 @app.route('/')
 def index():
@@ -39,47 +127,31 @@ def index():
 def generate_ladder():
     """Generate a new options ladder exercise"""
     try:
-        if not CYTHON_AVAILABLE:
-            return jsonify({
-                'success': False,
-                'error': 'Cython module not compiled. Run: python setup.py build_ext --inplace'
-            })
-
         data = request.get_json()
         num_strikes = int(data.get('num_strikes', 5))
         use_spreads = data.get('use_spreads', False)
 
+        if not MIN_STRIKES <= num_strikes <= MAX_STRIKES:
+            return error_response(f"Number of strikes must be between {MIN_STRIKES} and {MAX_STRIKES}")
+
         if use_spreads:
-            # Check if the function exists
-            if not hasattr(options_ladder_fast, 'generate_exercise_ladder_with_spreads'):
-                return jsonify({
-                    'success': False,
-                    'error': 'Function generate_exercise_ladder_with_spreads not found. Please recompile the Cython module with the latest code.'
-                })
+            if generate_spreads_exercise is None:
+                return error_response(spreads_error)
 
             # Generate exercise with spreads
-            real_ladder, exercise_data, stock_price, r_c = options_ladder_fast.generate_exercise_ladder_with_spreads(
+            real_ladder, exercise_data, stock_price, r_c = generate_spreads_exercise(
                 num_strikes, missing_probability=0.3
             )
 
-            # Convert the keys for JSON serialization and fix any None issues
-            explicit_prices_json = {}
-            for (strike, option_type), value in exercise_data['explicit_prices'].items():
-                key = f"{strike}_{option_type}"
-                explicit_prices_json[key] = value
-                print(f"Converting explicit price: {strike}, {option_type} -> {key} = {value}")
-
-            spreads_json = {}
-            for (strike1, strike2, spread_type), value in exercise_data['spreads'].items():
-                key = f"{strike1}_{strike2}_{spread_type}"
-                spreads_json[key] = value
-                print(f"Converting spread: {strike1}, {strike2}, {spread_type} -> {key} = {value}")
-
-            # Debug logging
-            print(f"Final explicit prices JSON: {explicit_prices_json}")
-            print(f"Final spreads JSON: {spreads_json}")
-            print(f"Strikes: {exercise_data['strikes']}")
-            print(f"Strike types: {[type(s) for s in exercise_data['strikes']]}")
+            # Convert the tuple keys to "<strike>_<type>" strings the frontend looks up
+            explicit_prices_json = {f"{strike}_{option_type}": value
+                                    for (strike, option_type), value in exercise_data['explicit_prices'].items()}
+            spreads_json = {f"{strike1}_{strike2}_{spread_type}": value
+                            for (strike1, strike2, spread_type), value in exercise_data['spreads'].items()}
+
+            if app.debug:
+                app.logger.debug("Explicit prices: %s, spreads: %s, strikes: %s",
+                                 explicit_prices_json, spreads_json, exercise_data['strikes'])
 
             response = {
                 'success': True,
@@ -94,64 +166,23 @@ def generate_ladder():
                 'r_c': r_c
             }
         else:
-            # Check if the function exists
-            if not hasattr(options_ladder_fast, 'generate_exercise_ladder'):
-                # Fallback to basic function if available
-                if hasattr(options_ladder_fast, 'generate_options_ladder_fast'):
-                    return jsonify({
-                        'success': False,
-                        'error': 'Function generate_exercise_ladder not found. Only basic ladder generation available. Please recompile with the latest code.'
-                    })
-                else:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Required functions not found. Please recompile the Cython module.'
-                    })
-
-            # Generate simple exercise without spreads
-            real_ladder, exercise_ladder, stock_price, r_c = options_ladder_fast.generate_exercise_ladder(
-                num_strikes, missing_probability=0.4
+            if generate_simple_exercise is None:
+                return error_response(simple_error)
+
+            # Generate simple exercise without spreads, one price per row (either call OR put)
+            real_ladder, exercise_ladder, stock_price, r_c = generate_simple_exercise(
+                num_strikes, single_side=True
             )
 
-            # Modify exercise_ladder to ensure only ONE price per row (either call OR put)
-            # But don't create double None rows
-            modified_exercise_ladder = []
-
-            for call_price, strike, put_price in exercise_ladder:
-                # Check if both are None (shouldn't happen but safety check)
-                if call_price is None and put_price is None:
-                    # If both are None, randomly assign one from the real ladder
-                    real_row = next((row for row in real_ladder if row[1] == strike), None)
-                    if real_row:
-                        import random
-                        if random.random() < 0.5:
-                            modified_exercise_ladder.append([real_row[0], strike, None])  # Give call
-                        else:
-                            modified_exercise_ladder.append([None, strike, real_row[2]])  # Give put
-                    else:
-                        modified_exercise_ladder.append([call_price, strike, put_price])  # Fallback
-                elif call_price is not None and put_price is not None:
-                    # If both are present, randomly keep only one
-                    import random
-                    if random.random() < 0.5:
-                        modified_exercise_ladder.append([call_price, strike, None])  # Keep call
-                    else:
-                        modified_exercise_ladder.append([None, strike, put_price])  # Keep put
-                else:
-                    # One is None, one is not None - this is what we want
-                    modified_exercise_ladder.append([call_price, strike, put_price])
-
-            # Debug logging
-            print(f"Real ladder: {real_ladder}")
-            print(f"Original exercise ladder: {exercise_ladder}")
-            print(f"Modified exercise ladder (one price per row): {modified_exercise_ladder}")
-            print(f"Stock price: {stock_price}, r_c: {r_c}")
+            if app.debug:
+                app.logger.debug("Real ladder: %s, exercise ladder: %s, stock price: %s, r_c: %s",
+                                 real_ladder, exercise_ladder, stock_price, r_c)
 
             response = {
                 'success': True,
                 'exercise_type': 'simple',
                 'real_ladder': real_ladder,
-                'exercise_ladder': modified_exercise_ladder,
+                'exercise_ladder': exercise_ladder,
                 'stock_price': stock_price,
                 'r_c': r_c
             }
@@ -159,10 +190,10 @@ def generate_ladder():
         return jsonify(response)
 
     except Exception as e:
+        app.logger.exception("Error generating ladder")
         return jsonify({
             'success': False,
-            'error': f"Error generating ladder: {str(e)}",
-            'traceback': traceback.format_exc()
+            'error': f"Error generating ladder: {str(e)}"
         })
 
 
@@ -175,49 +206,40 @@ def check_answers():
         user_answers = data['user_answers']
         exercise_type = data.get('exercise_type', 'simple')
 
-        results = []
-        total_attempted = 0
-        total_correct = 0
         tolerance = 0.05  # 5 cent tolerance
 
-        for i, (real_row, user_row) in enumerate(zip(real_ladder, user_answers)):
-            real_call, real_strike, real_put = real_row
-            user_call, user_put = user_row.get('call'), user_row.get('put')
-
-            call_result = {'attempted': False, 'correct': False, 'difference': None}
-            put_result = {'attempted': False, 'correct': False, 'difference': None}
-
-            # Check call option
-            if user_call is not None and user_call != '':
-                call_result['attempted'] = True
-                total_attempted += 1
-                user_call_float = float(user_call)
-                difference = user_call_float - real_call
-                call_result['difference'] = round(difference, 3)
-
-                if abs(difference) <= tolerance:
-                    call_result['correct'] = True
-                    total_correct += 1
-
-            # Check put option
-            if user_put is not None and user_put != '':
-                put_result['attempted'] = True
-                total_attempted += 1
-                user_put_float = float(user_put)
-                difference = user_put_float - real_put
-                put_result['difference'] = round(difference, 3)
-
-                if abs(difference) <= tolerance:
-                    put_result['correct'] = True
-                    total_correct += 1
-
-            results.append({
+        real_ladder = real_ladder[:len(user_answers)]
+        user_answers = user_answers[:len(real_ladder)]
+        real = np.array(real_ladder, dtype=float).reshape(-1, 3)
+
+        # Unanswered or malformed fields become NaN so both sides can be checked in one array pass
+        user_calls = parse_answers([row.get('call') for row in user_answers])
+        user_puts = parse_answers([row.get('put') for row in user_answers])
+
+        call_attempted = ~np.isnan(user_calls)
+        put_attempted = ~np.isnan(user_puts)
+        call_diff = user_calls - real[:, 0]
+        put_diff = user_puts - real[:, 2]
+        call_correct = np.abs(call_diff) <= tolerance
+        put_correct = np.abs(put_diff) <= tolerance
+
+        total_attempted = int(np.count_nonzero(call_attempted) + np.count_nonzero(put_attempted))
+        total_correct = int(np.count_nonzero(call_correct) + np.count_nonzero(put_correct))
+
+        results = [
+            {
                 'strike': real_strike,
                 'real_call': real_call,
                 'real_put': real_put,
-                'call_result': call_result,
-                'put_result': put_result
-            })
+                'call_result': {'attempted': c_att, 'correct': c_ok, 'difference': c_diff if c_att else None},
+                'put_result': {'attempted': p_att, 'correct': p_ok, 'difference': p_diff if p_att else None}
+            }
+            for (real_call, real_strike, real_put), c_att, c_ok, c_diff, p_att, p_ok, p_diff in zip(
+                real_ladder,
+                call_attempted.tolist(), call_correct.tolist(), np.round(call_diff, 3).tolist(),
+                put_attempted.tolist(), put_correct.tolist(), np.round(put_diff, 3).tolist()
+            )
+        ]
 
         score = (total_correct / total_attempted * 100) if total_attempted > 0 else 0
 
@@ -232,10 +254,10 @@ def check_answers():
         })
 
     except Exception as e:
+        app.logger.exception("Error checking answers")
         return jsonify({
             'success': False,
-            'error': f"Error checking answers: {str(e)}",
-            'traceback': traceback.format_exc()
+            'error': f"Error checking answers: {str(e)}"
         })
 
 
@@ -0,0 +1,169 @@
+import math
+import random
+
+import numpy as np
+from numba import njit
+
+INV_SQRT2 = 0.7071067811865476
+
+
+@njit(cache=True, fastmath=True)
+def norm_cdf(x):
+    """Normal CDF via math.erf, which Numba compiles natively"""
+    return 0.5 * (1.0 + math.erf(x * INV_SQRT2))
+
+
+@njit(cache=True, fastmath=True)
+def black_scholes_call(S, K, r, T, sigma):
+    """Calculate Black-Scholes call option price"""
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    call_price = S * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d2)
+
+    # Ensure call is at least intrinsic value
+    return max(call_price, max(S - K, 0.0))
+
+
+@njit(cache=True)
+def _generate_ladder(num_strikes):
+    """
+    Compiled core of generate_options_ladder. Mirrors generate_options_ladder_columns
+    in options_ladder_fast.pyx, filling pre-allocated call/strike/put columns.
+    No fastmath here: it turns the /100.0 rounding into an inexact reciprocal multiply.
+
+    Returns:
+        tuple: (calls, strikes, puts, stock_price, r_c)
+    """
+    max_attempts = 100
+    center_index = num_strikes // 2
+    strikes = np.empty(num_strikes)
+    calls = np.empty(num_strikes)
+    puts = np.empty(num_strikes)
+    num_priced = 0
+    stock_price = 0.0
+    r_c = 0.0
+
+    for attempt in range(max_attempts):
+        # Generate random stock price between 5 and 100
+        stock_price = np.random.uniform(5.0, 100.0)
+
+        # Determine strike spacing based on stock price
+        if stock_price < 10:
+            spacing = 1.0 if np.random.random() < 0.5 else 2.0
+        elif stock_price < 50:
+            spacing = 5.0
+        else:
+            spacing = 5.0 if np.random.random() < 0.5 else 10.0
+
+        # Find a good center strike
+        center_strike = round(stock_price / spacing) * spacing
+
+        for i in range(num_strikes):
+            strikes[i] = max(center_strike + (i - center_index) * spacing, spacing)  # Ensure positive strikes
+        strikes.sort()
+
+        # Generate Black-Scholes parameters with tighter ranges for stability
+        r = np.random.uniform(0.02, 0.05)
+        T = np.random.uniform(0.25, 1.5)
+        base_sigma = np.random.uniform(0.18, 0.35)
+        r_c = round(np.random.uniform(0.1, 1.5) * 100) / 100.0  # Round to 2 decimal places
+
+        ladder_valid = True
+        num_priced = 0
+
+        for i in range(num_strikes):
+            K = strikes[i]
+
+            # Create more controlled volatility smile/skew
+            moneyness = K / stock_price
+
+            if moneyness < 0.90:  # Deep OTM puts
+                vol_adjustment = np.random.uniform(0.02, 0.08)
+            elif moneyness > 1.10:  # Deep OTM calls
+                vol_adjustment = np.random.uniform(0.01, 0.05)
+            elif moneyness < 0.95 or moneyness > 1.05:  # Slightly OTM
+                vol_adjustment = np.random.uniform(0.01, 0.03)
+            else:  # ATM
+                vol_adjustment = np.random.uniform(-0.01, 0.01)
+
+            sigma = max(base_sigma + vol_adjustment, 0.12)  # Minimum 12% vol
+
+            call_price = round(black_scholes_call(stock_price, K, r, T, sigma) * 100) / 100.0
+
+            # Put option price using put-call parity
+            put_price = round((call_price - stock_price + K - r_c) * 100) / 100.0
+
+            # Check both prices are above intrinsic value and parity holds
+            intrinsic_ok = call_price >= max(stock_price - K, 0.0) and put_price >= max(K - stock_price, 0.0)
+            parity_check = round(((call_price - put_price) - (stock_price - K + r_c)) * 10000) / 10000.0
+
+            if not intrinsic_ok or abs(parity_check) >= 0.01:
+                ladder_valid = False
+                break
+
+            calls[i] = call_price
+            puts[i] = put_price
+            num_priced += 1
+
+        # Check monotonicity (calls decreasing, puts increasing) and box spreads for arbitrage
+        if ladder_valid:
+            for i in range(1, num_strikes):
+                if calls[i] > calls[i - 1] + 0.01 or puts[i] < puts[i - 1] - 0.01:
+                    ladder_valid = False
+                    break
+
+                box_value = (calls[i - 1] - calls[i]) + (puts[i] - puts[i - 1])
+                if abs(box_value - (strikes[i] - strikes[i - 1])) > 0.05:
+                    ladder_valid = False
+                    break
+
+        if ladder_valid:
+            return calls, strikes, puts, round(stock_price * 100) / 100.0, r_c
+
+    # If we couldn't generate a valid ladder after max_attempts, return the rows priced on the last attempt
+    return calls[:num_priced], strikes[:num_priced], puts[:num_priced], round(stock_price * 100) / 100.0, r_c
+
+
+def generate_options_ladder(num_strikes):
+    """
+    Numba version of generate_options_ladder_fast, usable without building the
+    Cython extension. The first call compiles (or loads from cache) the kernel.
+
+    Args:
+        num_strikes (int): Number of different strike prices in the ladder
+
+    Returns:
+        tuple: (ladder, stock_price, r_c)
+    """
+    calls, strikes, puts, stock_price, r_c = _generate_ladder(num_strikes)
+    ladder = [[call, strike, put] for call, strike, put in zip(calls.tolist(), strikes.tolist(), puts.tolist())]
+    return ladder, stock_price, r_c
+
+
+def generate_exercise_ladder(num_strikes, missing_probability=0.4, single_side=False):
+    """
+    Generates simple exercise without spreads, matching the Cython module's API.
+    """
+    real_ladder, stock_price, r_c = generate_options_ladder(num_strikes)
+
+    exercise_ladder = []
+
+    for call_price, strike, put_price in real_ladder:
+        if single_side:
+            remove_call = random.random() >= 0.5
+            remove_put = not remove_call
+        else:
+            remove_call = random.random() < missing_probability
+            remove_put = random.random() < missing_probability
+
+            # If both would be removed, randomly keep one
+            if remove_call and remove_put:
+                if random.random() < 0.5:
+                    remove_call = False
+                else:
+                    remove_put = False
+
+        exercise_ladder.append([None if remove_call else call_price, strike, None if remove_put else put_price])
+
+    return real_ladder, exercise_ladder, stock_price, r_c
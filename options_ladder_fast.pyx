@@ -3,33 +3,17 @@
 # cython: cdivision=True
 
 import numpy as np
-cimport numpy as cnp
 cimport cython
-from libc.math cimport log, sqrt, exp, fmax
-from libc.stdlib cimport rand, RAND_MAX, srand
+from libc.math cimport log, sqrt, exp, erf, fmax
+from libc.stdlib cimport rand, RAND_MAX, srand, malloc, free
 from libc.time cimport time
 import random
 
-# Fast normal CDF approximation (Abramowitz and Stegun)
-cdef double norm_cdf(double x) nogil:
-    """Fast approximation of normal CDF with good accuracy"""
-    cdef double a1 = 0.254829592
-    cdef double a2 = -0.284496736
-    cdef double a3 = 1.421413741
-    cdef double a4 = -1.453152027
-    cdef double a5 = 1.061405429
-    cdef double p = 0.3275911
-    cdef double sign = 1.0
-    cdef double t, y, erf_approx
+cdef double INV_SQRT2 = 0.7071067811865476
 
-    if x < 0:
-        sign = -1.0
-        x = -x
-
-    t = 1.0 / (1.0 + p * x)
-    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * exp(-x * x)
-
-    return 0.5 * (1.0 + sign * y)
+cdef inline double norm_cdf(double x) nogil:
+    """Normal CDF computed directly from libm's erf"""
+    return 0.5 * (1.0 + erf(x * INV_SQRT2))
 
 cdef double uniform_random(double min_val, double max_val) nogil:
     """Generate uniform random number between min_val and max_val"""
@@ -54,17 +38,15 @@ cdef double black_scholes_call(double S, double K, double r, double T, double si
     # Ensure call is at least intrinsic value
     return fmax(call_price, fmax(S - K, 0.0))
 
-def generate_options_ladder_fast(int num_strikes):
+cdef int price_ladder(int num_strikes, double* calls, double* strikes, double* puts,
+                      double* stock_price_out, double* r_c_out):
     """
-    Optimized version of generate_options_ladder using Cython.
+    Price an options ladder into caller-owned call/strike/put buffers.
     Ensures all call and put prices are above intrinsic value, parity holds,
     monotonicity is preserved, and no arbitrage opportunities exist.
 
-    Args:
-        num_strikes (int): Number of different strike prices in the ladder
-
-    Returns:
-        tuple: (ladder, stock_price, r_c)
+    Returns the number of rows priced: num_strikes for a valid ladder, otherwise
+    the rows priced on the last attempt.
     """
     # Seed random number generator
     srand(<unsigned int> time(NULL))
@@ -72,19 +54,17 @@ def generate_options_ladder_fast(int num_strikes):
     # Declare all variables at the top
     cdef int max_attempts = 100
     cdef int attempt = 0
-    cdef double stock_price
+    cdef double stock_price = 0.0
     cdef int spacing
     cdef double center_strike
     cdef int center_index = num_strikes // 2
-    cdef cnp.ndarray[double, ndim=1] strikes
-    cdef int i, j
+    cdef int i, num_priced = 0
     cdef double strike
-    cdef double r, T, base_sigma, r_c
+    cdef double r, T, base_sigma, r_c = 0.0
     cdef double K, moneyness, vol_adjustment, sigma
     cdef double call_price, put_price, parity_left, parity_right, parity_check
     cdef double call_intrinsic, put_intrinsic
-    cdef bint intrinsic_check, parity_ok, ladder_valid, monotonicity_ok, arbitrage_ok
-    cdef double prev_call, prev_put, current_call, current_put
+    cdef bint intrinsic_check, parity_ok, ladder_valid
     cdef double call_spread, put_spread, box_value, strike_diff
 
     # Keep generating until we get a valid ladder
@@ -107,16 +87,10 @@ def generate_options_ladder_fast(int num_strikes):
         # Find a good center strike
         center_strike = round(stock_price / spacing) * spacing
 
-        # Create strikes array
-        strikes = np.zeros(num_strikes, dtype=np.float64)
-
         for i in range(num_strikes):
             strike = center_strike + (i - center_index) * spacing
             strikes[i] = fmax(strike, spacing)  # Ensure positive strikes
 
-        # Sort strikes
-        strikes = np.sort(strikes)
-
         # Generate Black-Scholes parameters with tighter ranges for stability
         r = uniform_random(0.02, 0.05)
         T = uniform_random(0.25, 1.5)
@@ -125,8 +99,8 @@ def generate_options_ladder_fast(int num_strikes):
         r_c = round(r_c * 100) / 100.0  # Round to 2 decimal places
 
         # Generate the options ladder
-        ladder = []
         ladder_valid = True
+        num_priced = 0
 
         for i in range(num_strikes):
             K = strikes[i]
@@ -171,53 +145,91 @@ def generate_options_ladder_fast(int num_strikes):
                 ladder_valid = False
                 break
 
-            ladder.append([call_price, K, put_price])
+            calls[i] = call_price
+            puts[i] = put_price
+            num_priced += 1
 
         # Check monotonicity: calls decreasing, puts increasing with strike
-        if ladder_valid and len(ladder) > 1:
-            monotonicity_ok = True
-            for i in range(1, len(ladder)):
-                prev_call = ladder[i - 1][0]
-                current_call = ladder[i][0]
-                prev_put = ladder[i - 1][2]
-                current_put = ladder[i][2]
-
+        if ladder_valid:
+            for i in range(1, num_strikes):
                 # Calls should decrease (or stay same) as strike increases
-                if current_call > prev_call + 0.01:  # Small tolerance
-                    monotonicity_ok = False
-                    break
-
                 # Puts should increase (or stay same) as strike increases
-                if current_put < prev_put - 0.01:  # Small tolerance
-                    monotonicity_ok = False
+                if calls[i] > calls[i - 1] + 0.01 or puts[i] < puts[i - 1] - 0.01:  # Small tolerance
+                    ladder_valid = False
                     break
 
-            if not monotonicity_ok:
-                ladder_valid = False
-
         # Check box spreads for arbitrage
-        if ladder_valid and len(ladder) > 1:
-            arbitrage_ok = True
-            for i in range(len(ladder) - 1):
-                call_spread = ladder[i][0] - ladder[i + 1][0]  # Long lower strike call
-                put_spread = ladder[i + 1][2] - ladder[i][2]  # Long higher strike put
+        if ladder_valid:
+            for i in range(num_strikes - 1):
+                call_spread = calls[i] - calls[i + 1]  # Long lower strike call
+                put_spread = puts[i + 1] - puts[i]  # Long higher strike put
                 box_value = call_spread + put_spread
-                strike_diff = ladder[i + 1][1] - ladder[i][1]
+                strike_diff = strikes[i + 1] - strikes[i]
 
                 # Box should equal strike difference within small tolerance
                 if abs(box_value - strike_diff) > 0.05:
-                    arbitrage_ok = False
+                    ladder_valid = False
                     break
 
-            if not arbitrage_ok:
-                ladder_valid = False
-
         # If ladder is valid, return it
         if ladder_valid:
-            return ladder, round(stock_price * 100) / 100.0, r_c
+            stock_price_out[0] = round(stock_price * 100) / 100.0
+            r_c_out[0] = r_c
+            return num_strikes
+
+    # If we couldn't generate a valid ladder after max_attempts, return the rows priced on the last attempt
+    stock_price_out[0] = round(stock_price * 100) / 100.0
+    r_c_out[0] = r_c
+    return num_priced
+
+def generate_options_ladder_columns(int num_strikes):
+    """
+    Generate an options ladder as contiguous columns rather than rows.
+
+    Args:
+        num_strikes (int): Number of different strike prices in the ladder
+
+    Returns:
+        tuple: (calls, strikes, puts, stock_price, r_c) with float64 numpy arrays
+    """
+    cdef double stock_price, r_c
+    cdef int num_priced
+
+    calls_arr = np.empty(num_strikes, dtype=np.float64)
+    strikes_arr = np.empty(num_strikes, dtype=np.float64)
+    puts_arr = np.empty(num_strikes, dtype=np.float64)
+    cdef double[::1] calls = calls_arr
+    cdef double[::1] strikes = strikes_arr
+    cdef double[::1] puts = puts_arr
 
-    # If we couldn't generate a valid ladder after max_attempts, return the last attempt
-    return ladder, round(stock_price * 100) / 100.0, r_c
+    num_priced = price_ladder(num_strikes, &calls[0], &strikes[0], &puts[0], &stock_price, &r_c)
+    return calls_arr[:num_priced], strikes_arr[:num_priced], puts_arr[:num_priced], stock_price, r_c
+
+def generate_options_ladder_fast(int num_strikes):
+    """
+    Optimized version of generate_options_ladder using Cython.
+
+    Args:
+        num_strikes (int): Number of different strike prices in the ladder
+
+    Returns:
+        tuple: (ladder, stock_price, r_c)
+    """
+    cdef double stock_price, r_c
+    cdef int i, num_priced
+    cdef double* buf = <double*> malloc(3 * num_strikes * sizeof(double))
+
+    if buf == NULL:
+        raise MemoryError()
+
+    try:
+        num_priced = price_ladder(num_strikes, buf, buf + num_strikes, buf + 2 * num_strikes,
+                                  &stock_price, &r_c)
+        ladder = [[buf[i], buf[num_strikes + i], buf[2 * num_strikes + i]] for i in range(num_priced)]
+    finally:
+        free(buf)
+
+    return ladder, stock_price, r_c
 
 def generate_exercise_ladder_with_spreads(int num_strikes, double missing_probability=0.3):
     """
@@ -238,6 +250,10 @@ def generate_exercise_ladder_with_spreads(int num_strikes, double missing_probab
         # Generate the complete ladder
         real_ladder, stock_price, r_c = generate_options_ladder_fast(num_strikes)
 
+        # The exercise builders index into the ladder (unchecked, boundscheck is off)
+        if not real_ladder:
+            raise ValueError(f"Could not generate a valid ladder with {num_strikes} strikes")
+
         # Calculate all possible spreads
         spreads = calculate_all_spreads(real_ladder)
 
@@ -288,7 +304,6 @@ def create_simple_solvable_exercise(real_ladder, spreads):
     exercise_data['explicit_prices'][(real_ladder[0][1], 'call')] = real_ladder[0][0]
 
     # Give all call spreads OR all put spreads (randomly choose)
-    import random
     if random.random() < 0.5:
         # Give call spreads
         for i in range(len(real_ladder) - 1):
@@ -340,8 +355,6 @@ def create_strategic_exercise(real_ladder, spreads, missing_probability):
     Create exercise that strategically uses spreads and explicit prices.
     Ensures all strikes are solvable by providing sufficient information.
     """
-    import random
-
     exercise_data = {
         'explicit_prices': {},  # (strike, 'call'/'put'): price or None
         'spreads': {},  # (strike1, strike2, 'call'/'put'): spread_value or None (no box spreads)
@@ -385,20 +398,19 @@ def create_strategic_exercise(real_ladder, spreads, missing_probability):
     # Strategy 3: Add a few more explicit prices but not too many
     num_additional_prices = random.randint(1, 2)  # 1-2 additional explicit prices
     available_strikes = [row[1] for row in real_ladder if row[1] != anchor_strike]
+    real_by_strike = {row[1]: row for row in real_ladder}
 
     for _ in range(min(num_additional_prices, len(available_strikes))):
         if available_strikes:
             strike_idx = random.randint(0, len(available_strikes) - 1)
             strike = available_strikes.pop(strike_idx)
 
-            # Find the ladder row for this strike
-            for call, s, put in real_ladder:
-                if s == strike:
-                    if random.random() < 0.5:
-                        exercise_data['explicit_prices'][(strike, 'call')] = call
-                    else:
-                        exercise_data['explicit_prices'][(strike, 'put')] = put
-                    break
+            # Look up the ladder row for this strike
+            real_row = real_by_strike[strike]
+            if random.random() < 0.5:
+                exercise_data['explicit_prices'][(strike, 'call')] = real_row[0]
+            else:
+                exercise_data['explicit_prices'][(strike, 'put')] = real_row[2]
 
     return exercise_data
 
@@ -477,8 +489,6 @@ def add_fallback_hints(real_ladder, exercise_data):
     Add minimal hints to ensure the exercise is solvable.
     Uses a more systematic approach to ensure connectivity.
     """
-    import random
-
     # Check current solvability
     if verify_exercise_solvable(exercise_data, 0, 0):  # Use dummy values for quick check
         return exercise_data
@@ -662,28 +672,45 @@ def solve_exercise_step_by_step(exercise_data, stock_price, r_c):
     else:
         print(f"\n✓ All strikes successfully solved!")
 
-def generate_exercise_ladder(int num_strikes, double missing_probability=0.4):
+def generate_exercise_ladder(int num_strikes, double missing_probability=0.4, bint single_side=False):
     """
     Backward compatibility - generates simple exercise without spreads.
+
+    Args:
+        num_strikes (int): Number of strikes in the ladder
+        missing_probability (double): Probability of removing each price (default 0.4)
+        single_side (bint): Keep exactly one price per row, call or put with equal odds.
+            missing_probability is ignored when set.
+
+    Returns:
+        tuple: (real_ladder, exercise_ladder, stock_price, r_c)
     """
+    cdef bint remove_call, remove_put
+
     # Generate the complete ladder
     real_ladder, stock_price, r_c = generate_options_ladder_fast(num_strikes)
 
     # Create exercise version with some prices missing
     exercise_ladder = []
 
+    # Hide decisions come from Python's random: generate_options_ladder_columns
+    # reseeds rand() from time(NULL), which would fix the mask for a whole second
     for call_price, strike, put_price in real_ladder:
-        # Randomly decide what to keep/remove
-        # Always keep at least one price per row
-        remove_call = random.random() < missing_probability
-        remove_put = random.random() < missing_probability
-
-        # If both would be removed, randomly keep one
-        if remove_call and remove_put:
-            if random.random() < 0.5:
-                remove_call = False
-            else:
-                remove_put = False
+        if single_side:
+            remove_call = random.random() >= 0.5
+            remove_put = not remove_call
+        else:
+            # Randomly decide what to keep/remove
+            # Always keep at least one price per row
+            remove_call = random.random() < missing_probability
+            remove_put = random.random() < missing_probability
+
+            # If both would be removed, randomly keep one
+            if remove_call and remove_put:
+                if random.random() < 0.5:
+                    remove_call = False
+                else:
+                    remove_put = False
 
         # Create the exercise row
         exercise_call = None if remove_call else call_price
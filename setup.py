@@ -0,0 +1,43 @@
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+import numpy
+import sys
+
+# Compiler flags per toolchain: MSVC on Windows, clang on macOS, GCC elsewhere
+if sys.platform == 'win32':
+    extra_compile_args = ["/O2", "/fp:fast", "/GL"]
+    extra_link_args = ["/LTCG"]
+elif sys.platform == 'darwin':
+    extra_compile_args = ["-O3", "-ffast-math", "-march=native", "-funroll-loops", "-flto", "-fvectorize"]
+    extra_link_args = ["-O3", "-flto"]
+else:
+    extra_compile_args = ["-O3", "-ffast-math", "-march=native", "-funroll-loops", "-flto", "-fno-plt"]
+    extra_link_args = ["-O3", "-flto"]
+
+extensions = [
+    Extension(
+        "options_ladder_fast",
+        ["options_ladder_fast.pyx"],
+        include_dirs=[numpy.get_include()],
+        define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
+    )
+]
+
+setup(
+    name="options_ladder_fast",
+    ext_modules=cythonize(
+        extensions,
+        compiler_directives={
+            'language_level': 3,
+            'boundscheck': False,
+            'wraparound': False,
+            'cdivision': True,
+            'initializedcheck': False,
+            'nonecheck': False,
+            'infer_types': True,
+            'cdivision_warnings': False,
+        },
+    ),
+)